@@ -1,34 +1,67 @@
 import os
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, request, jsonify, abort
 from gemini_client import GeminiClient
 from focus_tracking import focus_tracker
+from goal_optimizer import optimize_goals, MAX_HORIZON_DAYS
+from progress_summary import progress_summary
+from event_log import EventLog
+from assets import StaticAssets, PageCache, compress_response
+from prompts import build_quiz_prompt, parse_quiz_questions
+from cohort import stream_cohort, DEFAULT_MAX_WORKERS
+import atexit
 import datetime
 import json
+import math
+import time
 
-app = Flask(__name__, template_folder='../templates')
+app = Flask(__name__, template_folder='../templates', static_folder=None)
 client = GeminiClient()
 
 print("Starting Flask app...")
 print(f"Template folder: {app.template_folder}")
 
+# Durable progress, quiz and focus history, replayed from disk on startup
+data_dir = os.getenv('STUDY_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+event_log = EventLog(data_dir)
+progress_summary.attach_log(event_log)
+atexit.register(event_log.close)
+
+# Seconds between focus stats pushed to /api/focus-tracking/events
+FOCUS_EVENT_INTERVAL = 1
+
+# Upper bound on concurrent LLM calls for one cohort request
+COHORT_MAX_WORKERS = int(os.getenv('COHORT_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+
+# Fingerprinted static bundles; templates reference them through asset_url()
+assets = StaticAssets(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'static'))
+app.jinja_env.globals['asset_url'] = assets.url
+
+# Page shells have no per-request data, so render them once up front
+pages = PageCache(app, [
+    'index.html',
+    'focus-detection.html',
+    'timetable.html',
+    'study-now.html',
+    'progress.html',
+    'goal-optimizer.html'
+])
+
 # Global storage for the latest timetable
 latest_timetable = None
 
-# Global storage for progress data
-progress_data = {
-    'total_hours': 0,
-    'topics_covered': 0,
-    'day_streak': 0,
-    'average_focus': 0,
-    'subjects': {}  # subject -> {'hours_studied': 0, 'total_hours': 0, 'last_updated': ''}
-}
-
-# Global storage for quiz data
+# Global storage for quiz data (history lives in progress_summary)
 quiz_data = {
-    'current_quiz': None,
-    'quiz_history': []
+    'current_quiz': None
 }
 
+def conditional_json(body, key, resource):
+    """Serve a pre-serialized JSON body with an ETag, answering 304 when unchanged"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(f'{resource}-{key}')
+    # Make browsers revalidate every time instead of guessing freshness
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
 def parse_deadline(deadline_str):
     """Parse deadline string into datetime object"""
     try:
@@ -68,29 +101,120 @@ def parse_deadline(deadline_str):
     except Exception:
         return None
 
+def parse_number(value, field, subject):
+    """Convert a numeric request field, raising ValueError unless it is a finite number"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} for {subject} must be a number')
+    if not math.isfinite(number):
+        raise ValueError(f'{field} for {subject} must be a number')
+    return number
+
+def require_object(value, what):
+    """Raise ValueError unless a decoded JSON value is an object"""
+    if not isinstance(value, dict):
+        raise ValueError(f'{what} must be an object')
+    return value
+
+def require_list(value, what):
+    """Raise ValueError unless a decoded JSON value is an array"""
+    if not isinstance(value, list):
+        raise ValueError(f'{what} must be a list')
+    return value
+
+def parse_availability(value):
+    """Validate an optional availability object for the goal optimizer"""
+    if value is None:
+        return None
+    require_object(value, 'availability')
+    for section in ('weekdays', 'dates'):
+        if value.get(section) is not None:
+            require_object(value[section], f'availability.{section}')
+    return value
+
+def parse_goals(raw_goals, completed_fallback=None, require_schedule=True):
+    """Validate goal dicts from a request body, raising ValueError on bad input"""
+    goals = []
+    for raw in require_list(raw_goals, 'goals'):
+        subject = require_object(raw, 'Each goal').get('subject')
+        if not subject or not isinstance(subject, str):
+            raise ValueError('Each goal needs a subject')
+
+        if not require_schedule:
+            goals.append({'subject': subject})
+            continue
+
+        deadline = raw.get('deadline')
+        target_hours = raw.get('target_hours', raw.get('target'))
+        if not all([deadline, target_hours]):
+            raise ValueError('Each goal needs a subject, deadline and target_hours')
+
+        deadline_date = parse_deadline(deadline)
+        if not deadline_date:
+            raise ValueError(f'Invalid deadline format for {subject}')
+        if (deadline_date - datetime.date.today()).days > MAX_HORIZON_DAYS:
+            raise ValueError(f'Deadline for {subject} is more than {MAX_HORIZON_DAYS} days away')
+
+        target_hours = parse_number(target_hours, 'target_hours', subject)
+        if target_hours < 0:
+            raise ValueError(f'target_hours for {subject} cannot be negative')
+
+        weight = raw.get('weight')
+        weight = 1.0 if weight is None else parse_number(weight, 'weight', subject)
+        if weight <= 0:
+            raise ValueError(f'weight for {subject} must be positive')
+
+        hours_completed = raw.get('hours_completed')
+        if hours_completed is None:
+            hours_completed = completed_fallback(subject) if completed_fallback else 0
+        hours_completed = parse_number(hours_completed, 'hours_completed', subject)
+        if hours_completed < 0:
+            raise ValueError(f'hours_completed for {subject} cannot be negative')
+
+        goals.append({
+            'subject': subject,
+            'deadline': deadline_date,
+            'target_hours': target_hours,
+            'weight': weight,
+            'hours_completed': hours_completed
+        })
+    return goals
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return pages.response('index.html', request)
 
 @app.route('/focus-detection')
 def focus_detection():
-    return render_template('focus-detection.html')
+    return pages.response('focus-detection.html', request)
 
 @app.route('/timetable')
 def timetable():
-    return render_template('timetable.html')
+    return pages.response('timetable.html', request)
 
 @app.route('/study-now')
 def study_now():
-    return render_template('study-now.html')
+    return pages.response('study-now.html', request)
 
 @app.route('/progress')
 def progress():
-    return render_template('progress.html')
+    return pages.response('progress.html', request)
 
 @app.route('/goal-optimizer')
 def goal_optimizer():
-    return render_template('goal-optimizer.html')
+    return pages.response('goal-optimizer.html', request)
+
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    response = assets.response(filename, request)
+    if response is None:
+        abort(404)
+    return response
+
+@app.after_request
+def compress(response):
+    return compress_response(response, request)
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -118,7 +242,8 @@ def start_focus_tracking():
 def stop_focus_tracking():
     """Stop focus tracking session"""
     try:
-        focus_tracker.stop_tracking()
+        session = focus_tracker.stop_tracking()
+        progress_summary.record_focus_session(session['elapsed_time'], session['instagram_switches'])
         stats = focus_tracker.get_stats()
         return jsonify({'status': 'stopped', 'stats': stats})
     except Exception as e:
@@ -142,6 +267,21 @@ def get_focus_stats():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def focus_event():
+    """One server-sent event carrying the current focus stats"""
+    return f"data: {json.dumps(focus_tracker.get_stats())}\n\n"
+
+@app.route('/api/focus-tracking/events', methods=['GET'])
+def focus_events():
+    """Stream focus tracking statistics as server-sent events"""
+    def stream():
+        while True:
+            yield focus_event()
+            time.sleep(FOCUS_EVENT_INTERVAL)
+
+    return app.response_class(stream(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache'})
+
 @app.route('/api/timetable/create', methods=['POST'])
 def create_timetable():
     """Create a smart study timetable"""
@@ -155,6 +295,15 @@ def create_timetable():
 
         if not all([deadline, subject, target_hours]):
             return jsonify({'error': 'Missing required fields'}), 400
+        if not isinstance(subject, str):
+            return jsonify({'error': 'Subject must be text'}), 400
+
+        try:
+            target_hours = parse_number(target_hours, 'target', subject)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if target_hours <= 0:
+            return jsonify({'error': 'Target hours must be positive'}), 400
 
         # Validate and parse deadline
         deadline_date = parse_deadline(deadline)
@@ -231,6 +380,7 @@ def create_timetable():
             'structured_data': json_data,
             'created_at': datetime.datetime.now().isoformat()
         }
+        progress_summary.set_current_subject(subject, target_hours)
         
         # Clean up the schedule output by removing unwanted characters
         schedule_text = schedule_text.replace('*', '').replace('--', '').replace('#', '')
@@ -240,6 +390,97 @@ def create_timetable():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/goals/optimize', methods=['POST'])
+def optimize_study_goals():
+    """Allocate study hours across several subjects without calling the AI"""
+    try:
+        data = require_object(request.get_json(silent=True) or {}, 'Request body')
+        raw_goals = data.get('goals') or []
+
+        if not raw_goals:
+            return jsonify({'error': 'At least one goal is required'}), 400
+
+        # Fall back to tracked progress when the caller doesn't say how much is done
+        goals = parse_goals(raw_goals, completed_fallback=progress_summary.hours_studied)
+
+        result = optimize_goals(goals, parse_availability(data.get('availability')))
+        return jsonify(result)
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def parse_cohort_request(data, include_timetables):
+    """Validate a cohort request body, returning (students, max_workers)"""
+    require_object(data, 'Request body')
+    raw_students = data.get('students') or []
+    if not raw_students:
+        raise ValueError('At least one student is required')
+    default_availability = parse_availability(data.get('availability'))
+
+    students = []
+    for raw in require_list(raw_students, 'students'):
+        student_id = require_object(raw, 'Each student').get('id') or raw.get('name')
+        if not student_id:
+            raise ValueError('Each student needs an id')
+        if not raw.get('goals'):
+            raise ValueError(f'Student {student_id} has no goals')
+
+        students.append({
+            'id': student_id,
+            'goals': parse_goals(raw['goals'], require_schedule=include_timetables),
+            'availability': parse_availability(raw.get('availability', default_availability))
+        })
+
+    max_workers = min(max(int(data.get('max_workers', COHORT_MAX_WORKERS)), 1), COHORT_MAX_WORKERS)
+    return students, max_workers
+
+def load_cohort_request(body, include_timetables):
+    """Decode and validate a raw cohort request body, raising ValueError on any bad input.
+
+    Shared by the Flask views and the async server so both answer the same
+    request the same way.
+    """
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError:
+        raise ValueError('Request body must be valid JSON')
+    try:
+        return parse_cohort_request(data, include_timetables)
+    except TypeError as e:
+        raise ValueError(str(e))
+
+def ndjson_line(record):
+    """Frame one cohort record for an application/x-ndjson stream"""
+    return json.dumps(record) + '\n'
+
+def cohort_response(include_timetables, include_quizzes):
+    """Validate a cohort request and stream its results as JSON lines"""
+    try:
+        students, max_workers = load_cohort_request(request.get_data(), include_timetables)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    results = stream_cohort(client, students, include_timetables, include_quizzes, max_workers)
+    return app.response_class((ndjson_line(record) for record in results),
+                              mimetype='application/x-ndjson')
+
+@app.route('/api/cohort/onboard', methods=['POST'])
+def onboard_cohort():
+    """Generate timetables and quizzes for a whole class in one streamed call"""
+    return cohort_response(include_timetables=True, include_quizzes=True)
+
+@app.route('/api/cohort/timetables', methods=['POST'])
+def create_cohort_timetables():
+    """Generate timetables for a whole class in one streamed call"""
+    return cohort_response(include_timetables=True, include_quizzes=False)
+
+@app.route('/api/cohort/quizzes', methods=['POST'])
+def generate_cohort_quizzes():
+    """Generate quizzes for a whole class in one streamed call"""
+    return cohort_response(include_timetables=False, include_quizzes=True)
+
 @app.route('/api/study-now/recommend', methods=['GET'])
 def get_study_recommendation():
     """Get AI-powered study recommendation based on current timetable"""
@@ -389,66 +630,34 @@ def get_study_recommendation():
 @app.route('/api/progress', methods=['GET'])
 def get_progress():
     """Get current progress data"""
-    global progress_data, latest_timetable
-    
-    # If we have a timetable, include subject-specific progress
-    current_subject = None
-    if latest_timetable:
-        current_subject = latest_timetable.get('subject')
-        if current_subject and current_subject not in progress_data['subjects']:
-            progress_data['subjects'][current_subject] = {
-                'hours_studied': 0,
-                'total_hours': latest_timetable.get('total_hours', 0),
-                'last_updated': ''
-            }
-    
-    return jsonify({
-        'total_hours': progress_data['total_hours'],
-        'topics_covered': progress_data['topics_covered'],
-        'day_streak': progress_data['day_streak'],
-        'average_focus': progress_data['average_focus'],
-        'subjects': progress_data['subjects'],
-        'current_subject': current_subject
-    })
+    key, body = progress_summary.progress_body()
+    return conditional_json(body, key, 'progress')
 
 @app.route('/api/progress/update', methods=['POST'])
 def update_progress():
     """Update progress for a subject"""
-    global progress_data, latest_timetable
-    
     try:
         data = request.get_json()
         subject = data.get('subject')
-        hours_studied = float(data.get('hours_studied', 0))
         
         if not subject:
             return jsonify({'error': 'Subject is required'}), 400
+
+        try:
+            hours_studied = parse_number(data.get('hours_studied', 0), 'hours_studied', subject)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if hours_studied < 0:
             return jsonify({'error': 'Hours studied cannot be negative'}), 400
         
-        # Initialize subject if not exists
-        if subject not in progress_data['subjects']:
-            progress_data['subjects'][subject] = {
-                'hours_studied': 0,
-                'total_hours': latest_timetable.get('total_hours', 0) if latest_timetable and latest_timetable.get('subject') == subject else 0,
-                'last_updated': ''
-            }
-        
-        # Update progress
-        progress_data['subjects'][subject]['hours_studied'] += hours_studied
-        progress_data['subjects'][subject]['last_updated'] = datetime.datetime.now().isoformat()
-        progress_data['total_hours'] += hours_studied
-        
-        # Update topics covered if this subject wasn't tracked before
-        if progress_data['subjects'][subject]['hours_studied'] == hours_studied:
-            progress_data['topics_covered'] += 1
+        entry, total_hours = progress_summary.record_study(subject, hours_studied)
         
         return jsonify({
             'success': True,
             'subject': subject,
-            'hours_studied': progress_data['subjects'][subject]['hours_studied'],
-            'total_hours': progress_data['total_hours']
+            'hours_studied': entry['hours_studied'],
+            'total_hours': total_hours
         })
         
     except Exception as e:
@@ -468,45 +677,11 @@ def generate_quiz():
             return jsonify({'error': 'No subject found in timetable.'}), 400
         
         # Generate quiz questions using AI
-        prompt = f"""
-        Create a 10-question multiple choice quiz for the subject: {subject}
-        
-        The quiz should test fundamental concepts and identify knowledge gaps.
-        Each question should have 4 options (A, B, C, D) with only one correct answer.
-        
-        Format the response as a JSON array of questions:
-        [
-            {{
-                "question": "What is the capital of France?",
-                "options": ["London", "Berlin", "Paris", "Madrid"],
-                "correct_answer": "C",
-                "topic": "Geography",
-                "difficulty": "easy"
-            }}
-        ]
-        
-        Make questions progressively more difficult and cover different aspects of {subject}.
-        Include topics like: basic concepts, problem-solving, applications, and advanced topics.
-        """
-        
-        ai_response = client.generate_response(prompt)
+        ai_response = client.generate_response(build_quiz_prompt(subject))
         
         # Parse the JSON response
         try:
-            # Extract JSON if wrapped in text
-            json_start = ai_response.find('[')
-            json_end = ai_response.rfind(']') + 1
-            if json_start != -1 and json_end > json_start:
-                json_str = ai_response[json_start:json_end]
-                questions = json.loads(json_str)
-            else:
-                questions = json.loads(ai_response)
-            
-            # Validate questions format
-            for q in questions:
-                if not all(key in q for key in ['question', 'options', 'correct_answer', 'topic']):
-                    q['topic'] = 'General'
-                    q['difficulty'] = 'medium'
+            questions = parse_quiz_questions(ai_response)
             
             # Store the quiz
             quiz_data['current_quiz'] = {
@@ -599,7 +774,7 @@ def submit_quiz():
         quiz['answers'] = answers
         
         # Add to history
-        quiz_data['quiz_history'].append({
+        progress_summary.record_quiz({
             'subject': quiz['subject'],
             'date': datetime.datetime.now().isoformat(),
             'score': results['score_percentage'],
@@ -629,13 +804,9 @@ def get_quiz_results():
 @app.route('/api/quiz/history', methods=['GET'])
 def get_quiz_history():
     """Get quiz history"""
-    global quiz_data
-    
     try:
-        return jsonify({
-            'history': quiz_data['quiz_history'],
-            'total_quizzes': len(quiz_data['quiz_history'])
-        })
+        key, body = progress_summary.history_body()
+        return conditional_json(body, key, 'quiz-history')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
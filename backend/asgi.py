@@ -0,0 +1,219 @@
+import asyncio
+import concurrent.futures
+import io
+import os
+import sys
+import threading
+
+from app import app, client, load_cohort_request, focus_event, ndjson_line, FOCUS_EVENT_INTERVAL
+from cohort import stream_cohort_async
+
+# Threads available to the blocking Flask routes
+DEFAULT_WORKERS = 64
+
+
+def _wsgi_str(value):
+    # PEP 3333: environ strings are bytes decoded as latin-1
+    return value.encode('utf-8').decode('latin-1')
+
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope and request body into a WSGI environ"""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': _wsgi_str(scope.get('root_path', '')),
+        'PATH_INFO': _wsgi_str(scope['path']),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        # The body is already fully read, so its length is known even for
+        # chunked requests that sent no Content-Length
+        'wsgi.input_terminated': True,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_LENGTH' or name == 'TRANSFER_ENCODING':
+            # Describe the framing of the body already read, not of this environ
+            continue
+        if name == 'CONTENT_TYPE':
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def _wait_disconnect(receive, disconnected):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            disconnected.set()
+            return
+
+
+class AsyncServer:
+    """ASGI front end for the Flask app.
+
+    Long-lived streams and fan-out LLM waits are served natively as coroutines
+    on the event loop. Every other route is an ordinary blocking Flask view
+    and runs on a bounded thread pool, so a slow view holds a thread but never
+    the event loop. The native routes reuse the Flask views' parsing and
+    framing, and hand rejected requests to the Flask view itself so errors
+    come back exactly as in dev mode.
+    """
+
+    def __init__(self, wsgi_app, workers=DEFAULT_WORKERS):
+        self.wsgi_app = wsgi_app
+        self.workers = workers
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                              thread_name_prefix='flask-worker')
+        self.routes = {
+            ('GET', '/api/focus-tracking/events'): self.focus_events,
+            ('POST', '/api/cohort/onboard'): self.cohort(True, True),
+            ('POST', '/api/cohort/timetables'): self.cohort(True, False),
+            ('POST', '/api/cohort/quizzes'): self.cohort(False, True),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler = self.routes.get((scope['method'], scope['path']), self.call_wsgi)
+        await handler(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def call_wsgi(self, scope, receive, send):
+        body = await _read_body(receive)
+        if body is None:
+            return
+        await self.run_wsgi(scope, body, receive, send)
+
+    async def run_wsgi(self, scope, body, receive, send):
+        """Run the Flask app on the thread pool for a request whose body is already read"""
+        loop = asyncio.get_running_loop()
+        disconnected = threading.Event()
+        watcher = asyncio.ensure_future(_wait_disconnect(receive, disconnected))
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def run():
+            started = {}
+
+            def start_response(status, headers, exc_info=None):
+                started['status'] = int(status.split(' ', 1)[0])
+                # The ASGI server adds its own Date header; a second one confuses caches
+                started['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                                      for k, v in headers if k.lower() != 'date']
+
+            result = self.wsgi_app(build_environ(scope, body), start_response)
+            try:
+                headers_sent = False
+                for chunk in result:
+                    if disconnected.is_set():
+                        return
+                    if not headers_sent:
+                        send_from_thread({'type': 'http.response.start', **started})
+                        headers_sent = True
+                    if chunk:
+                        send_from_thread({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                if not headers_sent:
+                    send_from_thread({'type': 'http.response.start', **started})
+                send_from_thread({'type': 'http.response.body', 'body': b''})
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+
+        try:
+            await loop.run_in_executor(self.executor, run)
+        finally:
+            watcher.cancel()
+
+    async def focus_events(self, scope, receive, send):
+        """Server-sent focus stats, one coroutine per connected page"""
+        disconnected = threading.Event()
+        watcher = asyncio.ensure_future(_wait_disconnect(receive, disconnected))
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'text/event-stream; charset=utf-8'),
+                                (b'cache-control', b'no-cache')]})
+        try:
+            while not disconnected.is_set():
+                event = focus_event().encode('utf-8')
+                await send({'type': 'http.response.body', 'body': event, 'more_body': True})
+                await asyncio.sleep(FOCUS_EVENT_INTERVAL)
+        finally:
+            watcher.cancel()
+
+    def cohort(self, include_timetables, include_quizzes):
+        async def handler(scope, receive, send):
+            body = await _read_body(receive)
+            if body is None:
+                return
+            try:
+                students, max_workers = load_cohort_request(body, include_timetables)
+            except ValueError:
+                # Let the Flask view produce the error response, hooks and all
+                await self.run_wsgi(scope, body, receive, send)
+                return
+
+            disconnected = threading.Event()
+            watcher = asyncio.ensure_future(_wait_disconnect(receive, disconnected))
+            await send({'type': 'http.response.start', 'status': 200,
+                        'headers': [(b'content-type', b'application/x-ndjson')]})
+            records = stream_cohort_async(client, students, include_timetables, include_quizzes, max_workers,
+                                          executor=self.executor)
+            try:
+                async for record in records:
+                    if disconnected.is_set():
+                        break
+                    line = ndjson_line(record).encode('utf-8')
+                    await send({'type': 'http.response.body', 'body': line, 'more_body': True})
+                await send({'type': 'http.response.body', 'body': b''})
+            finally:
+                await records.aclose()
+                watcher.cancel()
+
+        return handler
+
+
+def create_application(workers=DEFAULT_WORKERS):
+    return AsyncServer(app, workers)
+
+
+# For running under any ASGI server, e.g. `uvicorn asgi:application`
+application = create_application(int(os.getenv('SERVER_WORKERS', DEFAULT_WORKERS)))
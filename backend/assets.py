@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, render_template
+
+# Fingerprinted URLs change whenever the content does, so they never go stale
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Pages and unversioned URLs must be revalidated, which is cheap with an ETag
+REVALIDATE_CACHE = 'no-cache'
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript')
+# Below this the gzip header and CPU cost outweigh the savings
+MIN_COMPRESS_SIZE = 500
+
+
+class CachedBody:
+    """A response body kept in memory together with its gzipped form"""
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9)
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+
+    def response(self, request, cache_control):
+        if accepts_gzip(request) and len(self.gzipped) < len(self.body):
+            response = Response(self.gzipped, mimetype=self.mimetype)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(f'{self.etag}-gzip')
+        else:
+            response = Response(self.body, mimetype=self.mimetype)
+            response.set_etag(self.etag)
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = cache_control
+        return response.make_conditional(request)
+
+
+def accepts_gzip(request):
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+
+class StaticAssets:
+    """Static files loaded once at startup and served under fingerprinted names.
+
+    css/base.css is published as /static/css/base.<hash>.css; templates look up
+    the current URL through asset_url().
+    """
+
+    def __init__(self, static_dir, url_prefix='/static'):
+        self.url_prefix = url_prefix
+        self.urls = {}   # logical path -> fingerprinted URL
+        self.files = {}  # fingerprinted or logical path -> (CachedBody, immutable)
+
+        for root, _, names in os.walk(static_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                logical = os.path.relpath(path, static_dir).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    body = f.read()
+
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                cached = CachedBody(body, mimetype)
+                stem, ext = os.path.splitext(logical)
+                fingerprinted = f'{stem}.{cached.etag[:10]}{ext}'
+
+                self.files[fingerprinted] = (cached, True)
+                self.files[logical] = (cached, False)
+                self.urls[logical] = f'{url_prefix}/{fingerprinted}'
+
+    def url(self, logical):
+        """URL for a static file, e.g. asset_url('css/base.css')"""
+        return self.urls[logical]
+
+    def response(self, filename, request):
+        entry = self.files.get(filename)
+        if entry is None:
+            return None
+        cached, immutable = entry
+        return cached.response(request, IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE)
+
+
+class PageCache:
+    """Page templates rendered once at startup instead of on every request"""
+
+    def __init__(self, app, templates):
+        self.pages = {}
+        with app.app_context():
+            for name in templates:
+                html = render_template(name).encode('utf-8')
+                self.pages[name] = CachedBody(html, 'text/html')
+
+    def response(self, name, request):
+        return self.pages[name].response(request, REVALIDATE_CACHE)
+
+
+def compress_response(response, request):
+    """Gzip a dynamic response when the client accepts it and it's worth it"""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)
+            or not accepts_gzip(request)):
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    # The bytes changed but the content didn't, so only a weak ETag still holds
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    response.vary.add('Accept-Encoding')
+    return response
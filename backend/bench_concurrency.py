@@ -0,0 +1,157 @@
+"""Compare how many concurrent connections each server mode can hold.
+
+    python bench_concurrency.py --connections 1000
+
+For each mode this starts serve.py, opens N long-lived focus event streams
+(/api/focus-tracking/events) at once, and while they are all open measures the
+latency of ordinary /api/progress requests. It reports how many streams got
+their first event, how long that took, and how many threads the server used.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HOST = '127.0.0.1'
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def raise_fd_limit():
+    # Every stream costs a descriptor on both ends; children inherit the limit
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def server_threads(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def http_get(port, path, timeout):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        return await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+
+
+async def wait_until_ready(port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            await http_get(port, '/api/progress', 1)
+            return
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+async def open_stream(port, timeout):
+    """Open a focus event stream and wait for its first event"""
+    started = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+    writer.write(f'GET /api/focus-tracking/events HTTP/1.1\r\nHost: {HOST}\r\n\r\n'.encode())
+    await writer.drain()
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        if not line:
+            raise ConnectionError('stream closed')
+        if line.startswith(b'data:'):
+            return writer, time.perf_counter() - started
+
+
+async def measure(port, pid, connections, probes, timeout):
+    started = time.perf_counter()
+    results = await asyncio.gather(*(open_stream(port, timeout) for _ in range(connections)),
+                                   return_exceptions=True)
+    opened = [r for r in results if not isinstance(r, BaseException)]
+    connect_time = time.perf_counter() - started
+    threads = server_threads(pid)
+
+    latencies = []
+    failures = 0
+    for _ in range(probes):
+        probe_started = time.perf_counter()
+        try:
+            await http_get(port, '/api/progress', timeout)
+            latencies.append((time.perf_counter() - probe_started) * 1000)
+        except (OSError, asyncio.TimeoutError):
+            failures += 1
+
+    for writer, _ in opened:
+        writer.close()
+
+    latencies.sort()
+    return {
+        'streams_open': len(opened),
+        'connect_seconds': connect_time,
+        'first_event_p95_ms': (sorted(t for _, t in opened)[int(len(opened) * 0.95) - 1] * 1000) if opened else None,
+        'server_threads': threads,
+        'probe_p50_ms': statistics.median(latencies) if latencies else None,
+        'probe_p95_ms': latencies[int(len(latencies) * 0.95) - 1] if latencies else None,
+        'probe_failures': failures,
+    }
+
+
+def run_mode(mode, port, connections, probes, timeout):
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, STUDY_DATA_DIR=data_dir)
+        server = subprocess.Popen([sys.executable, 'serve.py', '--mode', mode, '--port', str(port)],
+                                  cwd=BACKEND_DIR, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            asyncio.run(wait_until_ready(port))
+            return asyncio.run(measure(port, server.pid, connections, probes, timeout))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def _fmt(value, spec):
+    return 'n/a' if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--probes', type=int, default=50)
+    parser.add_argument('--timeout', type=float, default=15)
+    parser.add_argument('--port', type=int, default=5101)
+    parser.add_argument('--modes', nargs='+', default=['dev', 'async'])
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    print(f'{args.connections} concurrent focus streams, {args.probes} /api/progress probes\n')
+    print(f"{'mode':<6} {'streams':>9} {'connect s':>10} {'1st evt p95':>12} "
+          f"{'threads':>8} {'probe p50':>10} {'probe p95':>10} {'failed':>7}")
+
+    for offset, mode in enumerate(args.modes):
+        r = run_mode(mode, args.port + offset, args.connections, args.probes, args.timeout)
+        print(f"{mode:<6} {r['streams_open']:>9} {r['connect_seconds']:>10.2f} "
+              f"{_fmt(r['first_event_p95_ms'], '.0f') + ' ms':>12} {_fmt(r['server_threads'], 'd'):>8} "
+              f"{_fmt(r['probe_p50_ms'], '.1f') + ' ms':>10} {_fmt(r['probe_p95_ms'], '.1f') + ' ms':>10} "
+              f"{r['probe_failures']:>7}")
+
+
+if __name__ == '__main__':
+    main()
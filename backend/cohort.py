@@ -0,0 +1,240 @@
+import asyncio
+import concurrent.futures
+import datetime
+import random
+import time
+
+import numpy as np
+
+from goal_optimizer import optimize_goals, GoalOptimizerError
+from prompts import build_quiz_prompt, parse_quiz_questions, build_plan_prompt, parse_plan_template
+
+# Upper bound on LLM calls in flight for one batch
+DEFAULT_MAX_WORKERS = 8
+
+QUIZ = 'quiz'
+PLAN = 'plan'
+
+
+def subject_key(subject):
+    """Normalize a subject name so "Data Structures" and "data  structures" share artifacts"""
+    return ' '.join(subject.split()).lower()
+
+
+def _parse_quiz_bank(ai_response):
+    return {'questions': parse_quiz_questions(ai_response)}
+
+
+# kind -> (prompt builder, response parser)
+ARTIFACTS = {
+    QUIZ: (build_quiz_prompt, _parse_quiz_bank),
+    PLAN: (build_plan_prompt, parse_plan_template)
+}
+
+
+def _priority(days_left):
+    if days_left <= 7:
+        return 'high'
+    if days_left <= 21:
+        return 'medium'
+    return 'low'
+
+
+def personalize_timetable(goals, plans, availability=None, start_date=None):
+    """Lay each subject's plan template over a student's own optimized hours.
+
+    Topics are mapped onto the student's cumulative study hours for that
+    subject in proportion to their effort, so a day's tasks are the topics its
+    hours fall into.
+    """
+    result = optimize_goals(goals, availability, start_date)
+    deadlines = {goal['subject']: goal['deadline'] for goal in goals}
+
+    edges = {}
+    for subject, plan in plans.items():
+        effort = np.array([topic['effort'] for topic in plan['topics']])
+        edges[subject] = np.cumsum(effort) / effort.sum()
+
+    allocated = {goal['subject']: goal['allocated_hours'] for goal in result['goals']}
+    studied = dict.fromkeys(allocated, 0.0)
+
+    daily_schedule = []
+    for day in result['schedule']:
+        date = datetime.date.fromisoformat(day['date'])
+        for subject, hours in day['allocations'].items():
+            plan = plans.get(subject)
+            start = studied[subject]
+            studied[subject] += hours
+
+            if plan and allocated[subject] > 0:
+                # Position of this day's hours within the subject, as a fraction
+                lo = start / allocated[subject]
+                hi = studied[subject] / allocated[subject]
+                first = int(np.searchsorted(edges[subject], lo, side='right'))
+                last = int(np.searchsorted(edges[subject], hi - 1e-9, side='left'))
+                topics = plan['topics'][first:last + 1] or plan['topics'][-1:]
+                tasks = [task for topic in topics for task in topic['tasks']]
+            else:
+                tasks = [f'Study {subject}']
+
+            daily_schedule.append({
+                'date': day['date'],
+                'subject': subject,
+                'hours': hours,
+                'tasks': tasks,
+                'priority': _priority((deadlines[subject] - date).days)
+            })
+
+    return {
+        'daily_schedule': daily_schedule,
+        'goals': result['goals'],
+        'infeasible': result['infeasible']
+    }
+
+
+class CohortBatch:
+    """Bookkeeping for one cohort request.
+
+    Each student is {"id", "goals": [...], "availability": optional}, with goals
+    in the shape optimize_goals expects. Every distinct subject needs its quiz
+    bank and plan template generated exactly once; drivers run jobs() however
+    they like and hand each response to complete(), which returns the records
+    that became ready:
+    - {"type": "subject", ...} for the finished shared artifact
+    - {"type": "student", ...} for each student whose subjects are now all ready
+    """
+
+    def __init__(self, students, include_timetables=True, include_quizzes=True, start_date=None):
+        self.students = students
+        self.include_timetables = include_timetables
+        self.include_quizzes = include_quizzes
+        self.start_date = start_date
+        self.started = time.perf_counter()
+        self.subjects = {}  # key -> display name of first occurrence
+        self.waiting = {}   # (kind, key) -> indexes of students waiting on it
+        self.pending = []   # per student, the artifacts still missing
+        self.artifacts = {}
+        kinds = ([PLAN] if include_timetables else []) + ([QUIZ] if include_quizzes else [])
+
+        for index, student in enumerate(students):
+            needed = set()
+            for goal in student['goals']:
+                key = subject_key(goal['subject'])
+                self.subjects.setdefault(key, goal['subject'])
+                for kind in kinds:
+                    needed.add((kind, key))
+                    self.waiting.setdefault((kind, key), []).append(index)
+            self.pending.append(needed)
+
+    def jobs(self):
+        """(kind, key, prompt) for every LLM call this batch needs"""
+        return [(kind, key, ARTIFACTS[kind][0](self.subjects[key])) for kind, key in self.waiting]
+
+    def complete(self, kind, key, ai_response):
+        record = {'type': 'subject', 'kind': kind, 'subject': self.subjects[key]}
+        try:
+            self.artifacts[(kind, key)] = ARTIFACTS[kind][1](ai_response)
+            record.update(self.artifacts[(kind, key)])
+        except (ValueError, TypeError, AttributeError):
+            self.artifacts[(kind, key)] = None
+            record['error'] = f'Failed to generate {kind} for {self.subjects[key]}'
+        records = [record]
+
+        for index in self.waiting[(kind, key)]:
+            self.pending[index].discard((kind, key))
+            if not self.pending[index]:
+                records.append(_student_record(self.students[index], self.artifacts, self.include_timetables,
+                                               self.include_quizzes, self.start_date))
+        return records
+
+    def summary(self):
+        return {
+            'type': 'done',
+            'students': len(self.students),
+            'subjects': len(self.subjects),
+            'llm_calls': len(self.waiting),
+            'elapsed_seconds': round(time.perf_counter() - self.started, 3)
+        }
+
+
+def stream_cohort(client, students, include_timetables=True, include_quizzes=True,
+                  max_workers=DEFAULT_MAX_WORKERS, start_date=None):
+    """Onboard a batch of students on a thread pool, yielding records as they become ready.
+
+    At most max_workers LLM calls run at once. Ends with a {"type": "done"} record.
+    """
+    batch = CohortBatch(students, include_timetables, include_quizzes, start_date)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(client.generate_content, prompt): (kind, key)
+                   for kind, key, prompt in batch.jobs()}
+        for future in concurrent.futures.as_completed(futures):
+            kind, key = futures[future]
+            yield from batch.complete(kind, key, future.result())
+    finally:
+        # Stop queued LLM calls if the client goes away mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield batch.summary()
+
+
+async def stream_cohort_async(client, students, include_timetables=True, include_quizzes=True,
+                              max_workers=DEFAULT_MAX_WORKERS, start_date=None, executor=None):
+    """Same as stream_cohort, but every LLM wait is a coroutine on the running event loop.
+
+    Personalizing timetables is CPU work, so it runs on executor (the loop's
+    default pool if None) rather than stalling every other coroutine.
+    """
+    batch = CohortBatch(students, include_timetables, include_quizzes, start_date)
+    semaphore = asyncio.Semaphore(max_workers)
+    loop = asyncio.get_running_loop()
+
+    async def generate(kind, key, prompt):
+        async with semaphore:
+            return kind, key, await client.generate_content_async(prompt)
+
+    tasks = [asyncio.ensure_future(generate(*job)) for job in batch.jobs()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            kind, key, ai_response = await next_done
+            records = await loop.run_in_executor(executor, batch.complete, kind, key, ai_response)
+            for record in records:
+                yield record
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield batch.summary()
+
+
+def _student_record(student, artifacts, include_timetables, include_quizzes, start_date):
+    record = {'type': 'student', 'id': student['id']}
+
+    if include_timetables:
+        plans = {}
+        for goal in student['goals']:
+            plan = artifacts.get((PLAN, subject_key(goal['subject'])))
+            if plan:
+                plans[goal['subject']] = plan
+        try:
+            record['timetable'] = personalize_timetable(student['goals'], plans,
+                                                        student.get('availability'), start_date)
+        except (GoalOptimizerError, ValueError, TypeError) as e:
+            # One student's bad input must not end the stream for the rest
+            record['timetable'] = {'error': str(e)}
+
+    if include_quizzes:
+        quizzes = {}
+        for goal in student['goals']:
+            key = subject_key(goal['subject'])
+            bank = artifacts.get((QUIZ, key))
+            if not bank:
+                quizzes[goal['subject']] = {'error': 'Quiz bank unavailable'}
+                continue
+            # Same questions for everyone, in an order stable for each student
+            order = list(range(len(bank['questions'])))
+            random.Random(f"{student['id']}:{key}").shuffle(order)
+            quizzes[goal['subject']] = {'question_order': order}
+        record['quizzes'] = quizzes
+
+    return record
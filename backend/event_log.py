@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+SNAPSHOT_FILE = 'snapshot.json'
+LOCK_FILE = 'lock'
+SEGMENT_PREFIX = 'events-'
+SEGMENT_SUFFIX = '.log'
+
+# Take a snapshot after this many events so replay on startup stays short
+DEFAULT_SNAPSHOT_EVERY = 1000
+
+
+def _segment_name(first_seq):
+    return f'{SEGMENT_PREFIX}{first_seq:012d}{SEGMENT_SUFFIX}'
+
+
+def _fsync_dir(directory):
+    # Make renames and new files durable; not every platform allows this
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class EventLog:
+    """Append-only, group-committed event log with periodic snapshots.
+
+    Events are JSON lines in numbered segment files. A single writer thread
+    drains everything queued since its last fsync and commits it with one
+    fsync, so concurrent writers share the cost. A snapshot stores the full
+    state up to a sequence number; older segments are deleted once it is on
+    disk, so startup only replays the tail written after the latest snapshot.
+    """
+
+    def __init__(self, directory, snapshot_every=DEFAULT_SNAPSHOT_EVERY):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._cond = threading.Condition()
+        self._queue = []  # ('event', seq, line) or ('snapshot', seq, body)
+        self._last_seq = 0
+        self._durable_seq = 0
+        self._since_snapshot = 0
+        self._segment = None
+        self._writer = None
+        self._closed = False
+        self._error = None
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = self._acquire_lock()
+
+    def _acquire_lock(self):
+        # Two writers would interleave sequence numbers and delete each
+        # other's segments, so only one process may own the directory
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), 'a')
+        if fcntl is None:
+            return lock_file
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise RuntimeError(f'Event log in {self.directory} is already in use by another process')
+        return lock_file
+
+    def _segments(self):
+        names = [n for n in os.listdir(self.directory)
+                 if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_SUFFIX)]
+        return sorted(names)
+
+    def recover(self):
+        """Load the latest snapshot and the events logged after it.
+
+        Returns (state or None, [events]). A torn final line left by a crash
+        mid-write is ignored along with anything after it in that segment.
+        """
+        state = None
+        snapshot_seq = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+            state = snapshot['state']
+            snapshot_seq = snapshot['seq']
+
+        events = []
+        last_seq = snapshot_seq
+        for name in self._segments():
+            path = os.path.join(self.directory, name)
+            segment_max = 0
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break
+                    segment_max = max(segment_max, event['seq'])
+                    if event['seq'] > snapshot_seq:
+                        events.append(event)
+                        last_seq = event['seq']
+            # Leftover from a crash between writing a snapshot and cleaning up
+            if segment_max <= snapshot_seq:
+                os.remove(path)
+
+        self._last_seq = self._durable_seq = last_seq
+        self._since_snapshot = len(events)
+        return state, events
+
+    def start(self):
+        """Open a fresh segment and start the writer thread"""
+        path = os.path.join(self.directory, _segment_name(self._last_seq + 1))
+        self._segment = open(path, 'w', encoding='utf-8')
+        _fsync_dir(self.directory)
+        self._writer = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+        self._writer.start()
+
+    def append(self, event):
+        """Queue an event and return its sequence number.
+
+        Callers that apply events under their own lock should call this under
+        that lock so the log order matches the order they were applied in.
+        """
+        with self._cond:
+            if self._error:
+                raise self._error
+            # NaN and Infinity aren't JSON; refuse them before taking a sequence number
+            line = json.dumps(dict(event, seq=self._last_seq + 1), allow_nan=False) + '\n'
+            self._last_seq += 1
+            self._since_snapshot += 1
+            self._queue.append(('event', self._last_seq, line))
+            self._cond.notify_all()
+            return self._last_seq
+
+    def snapshot_due(self):
+        return self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, state, seq):
+        """Queue a snapshot of state as of seq; written after all earlier events"""
+        body = json.dumps({'seq': seq, 'state': state}, allow_nan=False)
+        with self._cond:
+            self._since_snapshot = self._last_seq - seq
+            self._queue.append(('snapshot', seq, body))
+            self._cond.notify_all()
+
+    def wait(self, seq):
+        """Block until the event with this sequence number is on disk"""
+        with self._cond:
+            while self._durable_seq < seq and not self._error:
+                self._cond.wait()
+            if self._error:
+                raise self._error
+
+    def close(self):
+        """Flush everything queued and stop the writer"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._writer:
+            self._writer.join()
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                batch, self._queue = self._queue, []
+
+            try:
+                durable = self._commit(batch)
+            except OSError as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._durable_seq = max(self._durable_seq, durable)
+                self._cond.notify_all()
+
+    def _commit(self, batch):
+        durable = self._durable_seq
+        for kind, seq, payload in batch:
+            if kind == 'event':
+                self._segment.write(payload)
+                durable = seq
+            else:
+                self._sync_segment()
+                self._write_snapshot(seq, payload)
+        self._sync_segment()
+        return durable
+
+    def _sync_segment(self):
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+
+    def _write_snapshot(self, seq, body):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        # Everything up to seq is covered by the snapshot, so roll the log
+        self._segment.close()
+        new_name = _segment_name(seq + 1)
+        self._segment = open(os.path.join(self.directory, new_name), 'a', encoding='utf-8')
+        for name in self._segments():
+            if name < new_name:
+                os.remove(os.path.join(self.directory, name))
+        _fsync_dir(self.directory)
@@ -13,8 +13,13 @@ class FocusTracker:
         self.instagram_switches = 0
     
     def stop_tracking(self):
-        """Stop focus tracking"""
+        """Stop focus tracking and return the finished session"""
+        session = {
+            'elapsed_time': int(time.time() - self.start_time) if self.start_time and self.is_tracking else 0,
+            'instagram_switches': self.instagram_switches
+        }
         self.is_tracking = False
+        return session
     
     def record_instagram_switch(self):
         """Record an Instagram switch"""
@@ -97,4 +97,38 @@ class GeminiClient:
             return response.text
         except Exception as e:
             print(f"Error generating response: {e}")
-            return "I'm sorry, I encountered an error processing your request."
\ No newline at end of file
+            return "I'm sorry, I encountered an error processing your request."
+
+    def generate_content(self, prompt: str) -> str:
+        """Generate a one-off response without touching the chat history.
+
+        Unlike generate_response this keeps no shared state, so it can be
+        called from several threads at once.
+        """
+        if not self.chat:
+            return "AI service is not configured correctly."
+
+        try:
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=prompt
+            )
+            return response.text
+        except Exception as e:
+            print(f"Error generating content: {e}")
+            return "I'm sorry, I encountered an error processing your request."
+
+    async def generate_content_async(self, prompt: str) -> str:
+        """Async version of generate_content that waits on the event loop, not a thread"""
+        if not self.chat:
+            return "AI service is not configured correctly."
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=prompt
+            )
+            return response.text
+        except Exception as e:
+            print(f"Error generating content: {e}")
+            return "I'm sorry, I encountered an error processing your request."
@@ -0,0 +1,271 @@
+import datetime
+from typing import List, Dict, Optional
+
+import numpy as np
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# Default hours available per day when the caller gives no availability
+DEFAULT_DAILY_HOURS = 4.0
+
+# Shortest study session worth scheduling on a day, in hours
+MIN_SESSION_HOURS = 0.25
+
+# Furthest a deadline may be from the start date; bounds the per-day arrays
+MAX_HORIZON_DAYS = 730
+
+# Allocation works in whole hundredths of an hour so the schedule adds up exactly
+UNITS_PER_HOUR = 100
+
+
+class GoalOptimizerError(ValueError):
+    """Raised when the goals or availability passed to the optimizer are invalid"""
+
+
+def build_capacity(start_date, n_days, availability=None):
+    """Build the per-day study capacity (hours) for n_days starting at start_date.
+
+    availability may contain:
+    - "default": hours for any day not otherwise specified
+    - "weekdays": {"monday": 3, "saturday": 6, ...}
+    - "dates": {"2026-11-01": 0, ...} overrides for specific days
+    """
+    availability = availability or {}
+    if not isinstance(availability, dict):
+        raise GoalOptimizerError('Availability must be an object')
+    for section in ('weekdays', 'dates'):
+        if not isinstance(availability.get(section) or {}, dict):
+            raise GoalOptimizerError(f'Availability {section} must be an object')
+    default = float(availability.get('default', DEFAULT_DAILY_HOURS))
+
+    weekday_hours = np.full(7, default)
+    for name, hours in (availability.get('weekdays') or {}).items():
+        name = name.strip().lower()
+        if name not in WEEKDAYS:
+            raise GoalOptimizerError(f'Unknown weekday: {name}')
+        weekday_hours[WEEKDAYS.index(name)] = float(hours)
+
+    # Map every day in the horizon onto its weekday in one step
+    weekday_index = (start_date.weekday() + np.arange(n_days)) % 7
+    capacity = weekday_hours[weekday_index]
+
+    for date_str, hours in (availability.get('dates') or {}).items():
+        try:
+            day = datetime.date.fromisoformat(date_str)
+        except ValueError:
+            raise GoalOptimizerError(f'Invalid date in availability: {date_str}')
+        offset = (day - start_date).days
+        if 0 <= offset < n_days:
+            capacity[offset] = float(hours)
+
+    if np.any(capacity < 0):
+        raise GoalOptimizerError('Available hours cannot be negative')
+    return capacity
+
+
+def _trim_to_capacity(deadline_idx, remaining, weights, window_capacity):
+    """Cut demand so every deadline prefix fits in the hours available before it.
+
+    Goals are visited in deadline order. Whenever the running demand exceeds the
+    capacity available before the current deadline, hours are taken away from
+    the lowest-weight goals seen so far (latest deadline first on ties), which
+    keeps the most valuable hours.
+    """
+    order = np.lexsort((-weights, deadline_idx))
+    granted = remaining.copy()
+    accepted = []
+    demand = 0.0
+
+    for i in order:
+        accepted.append(i)
+        demand += granted[i]
+        excess = demand - window_capacity[i]
+        if excess <= 1e-9:
+            continue
+        for j in sorted(accepted, key=lambda k: (weights[k], -deadline_idx[k])):
+            cut = min(granted[j], excess)
+            granted[j] -= cut
+            demand -= cut
+            excess -= cut
+            if excess <= 1e-9:
+                break
+
+    return order, granted
+
+
+def _water_fill(free, hours):
+    """Spread hours over the free capacity as evenly as possible.
+
+    Finds the level L with sum(min(free, L)) == hours so each day gets the same
+    amount unless it has less free time than that.
+    """
+    if hours <= 0 or free.size == 0:
+        return np.zeros_like(free)
+    total = free.sum()
+    if hours >= total:
+        return free.copy()
+
+    ordered = np.sort(free)
+    n = ordered.size
+    below = np.concatenate(([0.0], np.cumsum(ordered)[:-1]))
+    # Hours placed if the level were set to each sorted capacity value
+    filled = below + ordered * (n - np.arange(n))
+    k = int(np.searchsorted(filled, hours))
+    level = (hours - below[k]) / (n - k)
+    return np.minimum(free, level)
+
+
+def _round_preserving_total(values):
+    """Round to integers while keeping the sum, using the largest-remainder method"""
+    floored = np.floor(values)
+    shortfall = int(round(values.sum() - floored.sum()))
+    if shortfall > 0:
+        # Stable sort so ties go to the earliest days
+        order = np.argsort(-(values - floored), kind='stable')
+        floored[order[:shortfall]] += 1
+    return floored.astype(np.int64)
+
+
+def _place_goal(free, need, min_session):
+    """Place one goal's units on the earliest days that can hold a full session.
+
+    Uses only as many days as keep every session at least min_session long,
+    spreads the units evenly over those days and rounds so the total is exact.
+    free and the result are whole units; since free is whole, rounding a share
+    up never exceeds a day's free time.
+    """
+    placed = np.zeros_like(free)
+    if need <= 0:
+        return placed
+
+    candidates = np.flatnonzero(free >= min_session)
+    if candidates.size:
+        days = max(1, min(need // min_session, candidates.size))
+        # Take more days if the first ones can't hold the whole goal
+        enough = int(np.searchsorted(np.cumsum(free[candidates]), need)) + 1
+        days = candidates[:min(max(days, enough), candidates.size)]
+        placed[days] = _round_preserving_total(_water_fill(free[days].astype(float), float(need)))
+
+    # Only scraps shorter than a session are left; use them earliest first
+    # rather than report hours that do fit as a shortfall
+    left = need - placed.sum()
+    if left > 0:
+        scraps = free - placed
+        taken = np.minimum(scraps, np.maximum(left - (np.cumsum(scraps) - scraps), 0))
+        placed += taken
+    return placed
+
+
+def optimize_goals(goals: List[Dict], availability: Optional[Dict] = None,
+                   start_date: Optional[datetime.date] = None) -> Dict:
+    """Allocate study hours across many subjects at once.
+
+    Each goal is a dict with "subject", "deadline" (datetime.date),
+    "target_hours" and optionally "weight" (default 1) and "hours_completed".
+    Hours are only scheduled on days before a goal's deadline.
+    """
+    if not goals:
+        raise GoalOptimizerError('At least one goal is required')
+
+    start_date = start_date or datetime.datetime.now().date()
+
+    subjects = []
+    for goal in goals:
+        subject = goal.get('subject')
+        if not subject:
+            raise GoalOptimizerError('Every goal needs a subject')
+        if subject in subjects:
+            raise GoalOptimizerError(f'Duplicate subject: {subject}')
+        if goal['deadline'] <= start_date:
+            raise GoalOptimizerError(f'Deadline for {subject} must be in the future')
+        if (goal['deadline'] - start_date).days > MAX_HORIZON_DAYS:
+            raise GoalOptimizerError(f'Deadline for {subject} is more than {MAX_HORIZON_DAYS} days away')
+        subjects.append(subject)
+
+    deadline_idx = np.array([(g['deadline'] - start_date).days for g in goals])
+    targets = np.array([float(g['target_hours']) for g in goals])
+    completed = np.array([float(g.get('hours_completed') or 0) for g in goals])
+    weights = np.array([float(1 if g.get('weight') is None else g['weight']) for g in goals])
+
+    if np.any(targets < 0) or np.any(completed < 0):
+        raise GoalOptimizerError('Hours cannot be negative')
+    if np.any(weights <= 0):
+        raise GoalOptimizerError('Weights must be positive')
+
+    n_days = int(deadline_idx.max())
+    capacity = build_capacity(start_date, n_days, availability)
+    capacity_units = np.floor(capacity * UNITS_PER_HOUR + 1e-6).astype(np.int64)
+    cumulative = np.concatenate(([0], np.cumsum(capacity_units)))
+    window_capacity = cumulative[deadline_idx]
+    remaining = np.maximum(targets - completed, 0.0)
+    remaining_units = np.round(remaining * UNITS_PER_HOUR).astype(np.int64)
+    min_session = int(round(MIN_SESSION_HOURS * UNITS_PER_HOUR))
+
+    order, granted = _trim_to_capacity(deadline_idx, remaining_units.astype(float), weights,
+                                       window_capacity.astype(float))
+    granted = np.round(granted).astype(np.int64)
+
+    # Earliest deadlines claim their window first; since every window starts
+    # today, later goals still see the same total free time in theirs.
+    # Each goal keeps only the days it was placed on, not a row per horizon day
+    placements = [None] * len(goals)
+    free = capacity_units.copy()
+    for i in order:
+        end = deadline_idx[i]
+        placed = _place_goal(free[:end], granted[i], min_session)
+        free[:end] -= placed
+        days = np.flatnonzero(placed)
+        placements[i] = (days, placed[days])
+
+    # Everything reported below derives from the same whole-unit schedule
+    allocated_units = np.array([units.sum() for _, units in placements])
+    allocated = allocated_units / UNITS_PER_HOUR
+    shortfall = (remaining_units - allocated_units) / UNITS_PER_HOUR
+
+    by_day = {}
+    for i, (days, units) in enumerate(placements):
+        for day, amount in zip(days.tolist(), units.tolist()):
+            by_day.setdefault(day, {})[subjects[i]] = amount / UNITS_PER_HOUR
+
+    schedule = []
+    for day in sorted(by_day):
+        allocations = by_day[day]
+        schedule.append({
+            'date': (start_date + datetime.timedelta(days=day)).isoformat(),
+            'total_hours': round(sum(allocations.values()), 2),
+            'allocations': allocations
+        })
+
+    goal_results = []
+    infeasible = []
+    for i, goal in enumerate(goals):
+        feasible = bool(shortfall[i] <= 0)
+        goal_results.append({
+            'subject': subjects[i],
+            'deadline': goal['deadline'].isoformat(),
+            'target_hours': float(targets[i]),
+            'hours_completed': float(completed[i]),
+            'weight': float(weights[i]),
+            'window_capacity': float(window_capacity[i]) / UNITS_PER_HOUR,
+            'allocated_hours': round(float(allocated[i]), 2),
+            'shortfall_hours': float(shortfall[i]),
+            'feasible': feasible
+        })
+        if not feasible:
+            infeasible.append({
+                'subject': subjects[i],
+                'shortfall_hours': float(shortfall[i]),
+                'shortfall_percentage': round(float(shortfall[i] / remaining[i] * 100), 1)
+            })
+
+    total_capacity = float(capacity.sum())
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': (start_date + datetime.timedelta(days=n_days - 1)).isoformat(),
+        'total_capacity': round(total_capacity, 2),
+        'total_allocated': round(float(allocated.sum()), 2),
+        'utilization': round(float(allocated.sum()) / total_capacity, 3) if total_capacity else 0.0,
+        'goals': goal_results,
+        'infeasible': infeasible,
+        'schedule': schedule
+    }
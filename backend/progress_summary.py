@@ -0,0 +1,291 @@
+import datetime
+import json
+import math
+import threading
+import uuid
+
+# Each Instagram switch during a focus session costs this many points out of 100
+FOCUS_SWITCH_PENALTY = 10
+
+
+def _check_number(event, field):
+    value = event.get(field)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValueError(f'{field} must be a non-negative number')
+
+
+def _check_subject(event):
+    if not isinstance(event.get('subject'), str) or not event['subject']:
+        raise ValueError('subject must be a non-empty string')
+
+
+def _check_time(event, field):
+    try:
+        datetime.datetime.fromisoformat(event[field])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f'{field} must be an ISO timestamp')
+
+
+def validate_event(event):
+    """Raise ValueError unless the event can be applied without failing halfway"""
+    kind = event.get('type')
+    if kind == 'current_subject':
+        _check_subject(event)
+        _check_number(event, 'total_hours')
+    elif kind == 'study':
+        _check_subject(event)
+        _check_number(event, 'hours_studied')
+        _check_time(event, 'when')
+    elif kind == 'focus':
+        _check_number(event, 'elapsed_time')
+        _check_number(event, 'instagram_switches')
+        _check_time(event, 'ended_at')
+    elif kind == 'quiz':
+        if not isinstance(event.get('entry'), dict):
+            raise ValueError('entry must be an object')
+        _check_number(event['entry'], 'score')
+    else:
+        raise ValueError(f'Unknown event type: {kind}')
+
+
+class ProgressSummary:
+    """Materialized progress dashboard data.
+
+    Every write updates the aggregates in place and bumps the version, so reads
+    can serve a pre-serialized body and an ETag without recomputing anything.
+    Writes are expressed as events so that, with an event log attached, the
+    same code rebuilds the state on startup.
+
+    A write is applied before it is durable, and a crash can lose it, so a
+    restarted process may reach the same version with different content.
+    Cache keys therefore also carry an id unique to this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.boot_id = uuid.uuid4().hex[:12]
+        self.event_log = None
+        self.version = 0
+        self.total_hours = 0.0
+        self.topics_covered = 0
+        self.day_streak = 0
+        self.last_study_date = None
+        self.focus_sessions = 0
+        self.focus_score_total = 0.0
+        self.current_subject = None
+        self.subjects = {}  # subject -> {'hours_studied', 'total_hours', 'completion_percentage', 'last_updated'}
+        self.quiz_history = []
+        self.quiz_score_total = 0.0
+        self._progress_body = None
+        self._progress_day = None
+        self._history_body = None
+
+    def _subject(self, subject):
+        if subject not in self.subjects:
+            self.subjects[subject] = {
+                'hours_studied': 0,
+                'total_hours': 0,
+                'completion_percentage': 0,
+                'last_updated': ''
+            }
+        return self.subjects[subject]
+
+    def _update_completion(self, entry):
+        total = float(entry['total_hours'] or 0)
+        entry['completion_percentage'] = round(min(entry['hours_studied'] / total * 100, 100), 1) if total > 0 else 0
+
+    def _bump(self):
+        self.version += 1
+        self._progress_body = None
+        self._history_body = None
+
+    def attach_log(self, event_log):
+        """Rebuild state from the log's snapshot and tail, then log new writes"""
+        state, events = event_log.recover()
+        with self._lock:
+            if state:
+                self._load_state(state)
+            for event in events:
+                self._apply(event)
+                self._bump()
+            self.event_log = event_log
+        event_log.start()
+
+    def _state(self):
+        return {
+            'version': self.version,
+            'total_hours': self.total_hours,
+            'topics_covered': self.topics_covered,
+            'day_streak': self.day_streak,
+            'last_study_date': self.last_study_date.isoformat() if self.last_study_date else None,
+            'focus_sessions': self.focus_sessions,
+            'focus_score_total': self.focus_score_total,
+            'current_subject': self.current_subject,
+            'subjects': self.subjects,
+            'quiz_history': self.quiz_history,
+            'quiz_score_total': self.quiz_score_total
+        }
+
+    def _load_state(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+        if self.last_study_date:
+            self.last_study_date = datetime.date.fromisoformat(self.last_study_date)
+
+    def _record(self, event):
+        """Append an event to the log, apply it and wait until it is durable.
+
+        The event is validated and logged before any state changes, so it is
+        either applied, logged and versioned completely or not at all.
+        """
+        validate_event(event)
+        seq = None
+        with self._lock:
+            if self.event_log:
+                seq = self.event_log.append(event)
+            result = self._apply(event)
+            self._bump()
+            if seq is not None and self.event_log.snapshot_due():
+                self.event_log.snapshot(self._state(), seq)
+        if seq is not None:
+            self.event_log.wait(seq)
+        return result
+
+    def _apply(self, event):
+        kind = event['type']
+        if kind == 'current_subject':
+            return self._apply_current_subject(event)
+        if kind == 'study':
+            return self._apply_study(event)
+        if kind == 'focus':
+            return self._apply_focus(event)
+        if kind == 'quiz':
+            return self._apply_quiz(event)
+        raise ValueError(f'Unknown event type: {kind}')
+
+    def _apply_current_subject(self, event):
+        self.current_subject = event['subject']
+        entry = self._subject(event['subject'])
+        entry['total_hours'] = event['total_hours']
+        self._update_completion(entry)
+
+    def _apply_study(self, event):
+        hours_studied = event['hours_studied']
+        when = datetime.datetime.fromisoformat(event['when'])
+        entry = self._subject(event['subject'])
+        if entry['hours_studied'] == 0 and hours_studied > 0:
+            self.topics_covered += 1
+
+        entry['hours_studied'] += hours_studied
+        entry['last_updated'] = event['when']
+        self._update_completion(entry)
+        self.total_hours += hours_studied
+
+        today = when.date()
+        if self.last_study_date is None or (today - self.last_study_date).days > 1:
+            self.day_streak = 1
+        elif (today - self.last_study_date).days == 1:
+            self.day_streak += 1
+        if self.last_study_date is None or today > self.last_study_date:
+            self.last_study_date = today
+
+        return dict(entry), self.total_hours
+
+    def _apply_focus(self, event):
+        score = max(0, 100 - event['instagram_switches'] * FOCUS_SWITCH_PENALTY)
+        self.focus_sessions += 1
+        self.focus_score_total += score
+
+    def _apply_quiz(self, event):
+        entry = event['entry']
+        self.quiz_history.append(entry)
+        self.quiz_score_total += entry['score']
+
+    def set_current_subject(self, subject, total_hours):
+        """Register the subject of a newly created timetable"""
+        self._record({'type': 'current_subject', 'subject': subject, 'total_hours': total_hours})
+
+    def record_study(self, subject, hours_studied, when=None):
+        """Add studied hours to a subject and roll the day streak forward"""
+        when = when or datetime.datetime.now()
+        return self._record({
+            'type': 'study',
+            'subject': subject,
+            'hours_studied': hours_studied,
+            'when': when.isoformat()
+        })
+
+    def record_focus_session(self, elapsed_time, instagram_switches, ended_at=None):
+        """Fold a finished focus session into the running average focus score"""
+        if elapsed_time <= 0:
+            return
+        ended_at = ended_at or datetime.datetime.now()
+        self._record({
+            'type': 'focus',
+            'elapsed_time': elapsed_time,
+            'instagram_switches': instagram_switches,
+            'ended_at': ended_at.isoformat()
+        })
+
+    def record_quiz(self, entry):
+        """Append a submitted quiz to the history"""
+        self._record({'type': 'quiz', 'entry': entry})
+
+    @property
+    def average_focus(self):
+        if not self.focus_sessions:
+            return 0
+        return round(self.focus_score_total / self.focus_sessions)
+
+    @property
+    def average_quiz_score(self):
+        if not self.quiz_history:
+            return 0
+        return round(self.quiz_score_total / len(self.quiz_history), 1)
+
+    def current_streak(self, today):
+        """The day streak as of today; it is broken once a whole day passes without study"""
+        if self.last_study_date is None or (today - self.last_study_date).days > 1:
+            return 0
+        return self.day_streak
+
+    def progress_body(self):
+        """Return (cache key, serialized /api/progress body).
+
+        The streak depends on today's date as well as the state, so the body
+        and its key are rebuilt when the day changes.
+        """
+        today = datetime.date.today()
+        with self._lock:
+            if self._progress_body is None or self._progress_day != today:
+                self._progress_day = today
+                self._progress_body = json.dumps({
+                    'total_hours': self.total_hours,
+                    'topics_covered': self.topics_covered,
+                    'day_streak': self.current_streak(today),
+                    'average_focus': self.average_focus,
+                    'subjects': self.subjects,
+                    'current_subject': self.current_subject,
+                    'quizzes_taken': len(self.quiz_history),
+                    'average_quiz_score': self.average_quiz_score,
+                    'version': self.version
+                })
+            return f'{self.boot_id}-{self.version}-{today.isoformat()}', self._progress_body
+
+    def history_body(self):
+        """Return (cache key, serialized /api/quiz/history body)"""
+        with self._lock:
+            if self._history_body is None:
+                self._history_body = json.dumps({
+                    'history': self.quiz_history,
+                    'total_quizzes': len(self.quiz_history)
+                })
+            return f'{self.boot_id}-{self.version}', self._history_body
+
+    def hours_studied(self, subject):
+        entry = self.subjects.get(subject)
+        return entry['hours_studied'] if entry else 0
+
+
+# Global summary instance
+progress_summary = ProgressSummary()
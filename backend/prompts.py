@@ -0,0 +1,100 @@
+import json
+
+
+def build_quiz_prompt(subject):
+    """Prompt for a 10-question multiple choice quiz on a subject"""
+    return f"""
+        Create a 10-question multiple choice quiz for the subject: {subject}
+
+        The quiz should test fundamental concepts and identify knowledge gaps.
+        Each question should have 4 options (A, B, C, D) with only one correct answer.
+
+        Format the response as a JSON array of questions:
+        [
+            {{
+                "question": "What is the capital of France?",
+                "options": ["London", "Berlin", "Paris", "Madrid"],
+                "correct_answer": "C",
+                "topic": "Geography",
+                "difficulty": "easy"
+            }}
+        ]
+
+        Make questions progressively more difficult and cover different aspects of {subject}.
+        Include topics like: basic concepts, problem-solving, applications, and advanced topics.
+        """
+
+
+def parse_quiz_questions(ai_response):
+    """Extract the question list from a quiz response.
+
+    Raises json.JSONDecodeError if the response holds no usable JSON.
+    """
+    # Extract JSON if wrapped in text
+    json_start = ai_response.find('[')
+    json_end = ai_response.rfind(']') + 1
+    if json_start != -1 and json_end > json_start:
+        questions = json.loads(ai_response[json_start:json_end])
+    else:
+        questions = json.loads(ai_response)
+
+    # Validate questions format
+    for q in questions:
+        if not all(key in q for key in ['question', 'options', 'correct_answer', 'topic']):
+            q['topic'] = 'General'
+            q['difficulty'] = 'medium'
+
+    return questions
+
+
+def build_plan_prompt(subject):
+    """Prompt for a reusable, student-independent study plan for a subject"""
+    return f"""
+        Create a study plan template for the subject: {subject}
+
+        Break the subject into 6 to 12 topics in the order they should be studied.
+        For each topic give 1-3 concrete study tasks and its relative effort
+        (a number, where larger means more study time is needed).
+        Do not assume any dates or a specific number of hours.
+
+        Format the response as a JSON object:
+        {{
+            "topics": [
+                {{
+                    "title": "topic name",
+                    "tasks": ["task1", "task2"],
+                    "effort": 2
+                }}
+            ],
+            "recommendations": ["tip1", "tip2"]
+        }}
+        """
+
+
+def parse_plan_template(ai_response):
+    """Extract the plan template from a plan response.
+
+    Raises json.JSONDecodeError if the response holds no usable JSON.
+    """
+    json_start = ai_response.find('{')
+    json_end = ai_response.rfind('}') + 1
+    if json_start != -1 and json_end > json_start:
+        plan = json.loads(ai_response[json_start:json_end])
+    else:
+        plan = json.loads(ai_response)
+
+    topics = []
+    for topic in plan.get('topics', []):
+        title = topic.get('title') or 'Study session'
+        topics.append({
+            'title': title,
+            'tasks': topic.get('tasks') or [title],
+            'effort': max(float(topic.get('effort') or 1), 0.1)
+        })
+    if not topics:
+        raise json.JSONDecodeError('Plan has no topics', ai_response, 0)
+
+    return {
+        'topics': topics,
+        'recommendations': plan.get('recommendations', [])
+    }
@@ -0,0 +1,46 @@
+"""Run the study planner server.
+
+    python serve.py                     # async mode: one event loop under uvicorn
+    python serve.py --workers 128       # more threads for the blocking Flask routes
+    python serve.py --mode dev          # Flask's development server, as app.py does
+
+Progress, timetable and focus state live in this process (and the event log
+has a single writer), so the server always runs as one process; --workers
+sizes the thread pool the blocking routes run on.
+"""
+import argparse
+import os
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 5001
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the AI Study Planner server')
+    parser.add_argument('--mode', choices=['async', 'dev'], default=os.getenv('SERVER_MODE', 'async'))
+    parser.add_argument('--host', default=os.getenv('SERVER_HOST', DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=int(os.getenv('SERVER_PORT', DEFAULT_PORT)))
+    parser.add_argument('--workers', type=int, default=None,
+                        help='threads for blocking routes in async mode (default: $SERVER_WORKERS or 64)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.mode == 'dev':
+        from app import app
+        print("Starting Flask development server...")
+        app.run(host=args.host, port=args.port)
+        return
+
+    import uvicorn
+    import asgi
+
+    application = asgi.create_application(args.workers) if args.workers else asgi.application
+    print(f"Starting async server with {application.workers} worker threads...")
+    uvicorn.run(application, host=args.host, port=args.port, lifespan='on', log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+const focusStartBtn = document.getElementById("focus-start-btn");
+const focusStopBtn = document.getElementById("focus-stop-btn");
+const instagramBtn = document.getElementById("instagram-btn");
+const instagramCount = document.getElementById("instagram-count");
+const sessionTime = document.getElementById("session-time");
+
+let statsStream = null;
+let startTime = null;
+let tabHiddenTime = null;
+let isTracking = false;
+
+focusStartBtn.addEventListener("click", async () => {
+  try {
+    const response = await fetch("/api/focus-tracking/start", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" }
+    });
+    const data = await response.json();
+    if (data.status === "started") {
+      focusStartBtn.disabled = true;
+      focusStopBtn.disabled = false;
+      instagramBtn.disabled = false;
+      startTime = Date.now();
+      isTracking = true;
+      console.log("✓ Focus tracking started");
+
+      setupTabDetection();
+      statsStream = new EventSource("/api/focus-tracking/events");
+      statsStream.onmessage = (event) => renderFocusStats(JSON.parse(event.data));
+    }
+  } catch (error) {
+    console.error("Error starting focus tracking:", error);
+    alert("Failed to start focus tracking");
+  }
+});
+
+focusStopBtn.addEventListener("click", async () => {
+  try {
+    const response = await fetch("/api/focus-tracking/stop", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" }
+    });
+    const data = await response.json();
+    if (data.status === "stopped") {
+      focusStartBtn.disabled = false;
+      focusStopBtn.disabled = true;
+      instagramBtn.disabled = true;
+      if (statsStream) statsStream.close();
+      statsStream = null;
+      startTime = null;
+      isTracking = false;
+      console.log("✓ Focus tracking stopped");
+      updateFocusStats();
+    }
+  } catch (error) {
+    console.error("Error stopping focus tracking:", error);
+    alert("Failed to stop focus tracking");
+  }
+});
+
+instagramBtn.addEventListener("click", async () => {
+  try {
+    const response = await fetch("/api/focus-tracking/record-instagram", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" }
+    });
+    const data = await response.json();
+    if (data.status === "recorded") {
+      console.log("✓ Distraction recorded");
+      updateFocusStats();
+    }
+  } catch (error) {
+    console.error("Error recording distraction:", error);
+    alert("Failed to record distraction");
+  }
+});
+
+function setupTabDetection() {
+  document.addEventListener("visibilitychange", async () => {
+    if (document.hidden) {
+      tabHiddenTime = Date.now();
+      console.log("Tab hidden - user may have switched away");
+    } else {
+      if (tabHiddenTime && isTracking) {
+        const hiddenDuration = Date.now() - tabHiddenTime;
+        console.log(`Tab was hidden for ${hiddenDuration}ms`);
+
+        if (hiddenDuration > 2000) {
+          const userConfirmed = confirm("Did you get distracted while away from this tab?");
+          if (userConfirmed) {
+            try {
+              const response = await fetch("/api/focus-tracking/record-instagram", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" }
+              });
+              if (response.ok) {
+                console.log("✓ Distraction auto-recorded");
+                updateFocusStats();
+              }
+            } catch (error) {
+              console.error("Error auto-recording distraction:", error);
+            }
+          }
+        }
+      }
+      tabHiddenTime = null;
+    }
+  });
+
+  window.addEventListener("focus", () => {
+    if (isTracking) {
+      console.log("Window regained focus");
+    }
+  });
+
+  window.addEventListener("blur", () => {
+    if (isTracking) {
+      console.log("Window lost focus");
+    }
+  });
+}
+
+async function updateFocusStats() {
+  try {
+    const response = await fetch("/api/focus-tracking/stats");
+    renderFocusStats(await response.json());
+  } catch (error) {
+    console.error("Error fetching stats:", error);
+  }
+}
+
+function renderFocusStats(stats) {
+  instagramCount.textContent = stats.instagram_switches || 0;
+
+  if (startTime) {
+    const elapsed = Math.floor((Date.now() - startTime) / 1000);
+    const minutes = Math.floor(elapsed / 60);
+    const seconds = elapsed % 60;
+    sessionTime.textContent = minutes > 0 ? `${minutes}m ${seconds}s` : `${seconds}s`;
+  }
+}
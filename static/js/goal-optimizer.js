@@ -0,0 +1,44 @@
+const optimizeBtn = document.getElementById("optimize-btn");
+optimizeBtn.addEventListener("click", async () => {
+  optimizeBtn.disabled = true;
+  optimizeBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Optimizing...';
+
+  try {
+    const cards = Array.from(document.querySelectorAll(".goal-card"));
+    const goals = cards.map((card) => {
+      const deadline = new Date();
+      deadline.setDate(deadline.getDate() + Number(card.dataset.weeks) * 7);
+      return {
+        subject: card.dataset.subject,
+        deadline: deadline.toISOString().slice(0, 10),
+        target_hours: Number(card.dataset.target),
+        hours_completed: Number(card.dataset.completed),
+      };
+    });
+
+    const response = await fetch("/api/goals/optimize", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ goals }),
+    });
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.error || "Optimization failed");
+    }
+
+    data.goals.forEach((goal, i) => {
+      const status = cards[i].querySelector(".goal-status");
+      const days = data.schedule.filter((day) => goal.subject in day.allocations).length;
+      const perDay = days ? (goal.allocated_hours / days).toFixed(1) : 0;
+      status.innerHTML = goal.feasible
+        ? `<i class="fas fa-check-circle" style="margin-right: 0.5rem;"></i> On Track: ~${perDay} hrs/day`
+        : `<i class="fas fa-triangle-exclamation" style="margin-right: 0.5rem;"></i> ${goal.shortfall_hours} hrs short of target`;
+    });
+  } catch (error) {
+    console.error("Error optimizing goals:", error);
+    alert("Failed to optimize goals");
+  } finally {
+    optimizeBtn.disabled = false;
+    optimizeBtn.innerHTML = '<i class="fas fa-brain"></i> Optimize Goals Now';
+  }
+});
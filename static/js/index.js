@@ -0,0 +1,89 @@
+const chatHistory = document.getElementById("chat-history");
+const userInput = document.getElementById("user-input");
+const sendBtn = document.getElementById("send-btn");
+
+userInput.focus();
+
+function escapeHtml(text) {
+  const map = {
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#039;"
+  };
+  return text.replace(/[&<>"']/g, m => map[m]);
+}
+
+function cleanMarkdown(text) {
+  // Remove markdown headers (#, ##, ###, etc.)
+  text = text.replace(/^#+\s+/gm, "");
+  // Remove horizontal rules (---, ***, ___)
+  text = text.replace(/^[-*_]{3,}$/gm, "");
+  // Remove asterisks used for bold/italic (* and **)
+  text = text.replace(/\*+/g, "");
+  // Remove underscores used for bold/italic (_ and __)
+  text = text.replace(/_+/g, "");
+  return text.trim();
+}
+
+function addMessage(sender, text) {
+  const messageElement = document.createElement("div");
+  messageElement.classList.add(
+    "message-bubble",
+    sender === "user" ? "user-message" : "agent-message"
+  );
+  // Clean markdown formatting for agent messages
+  let cleanedText = sender === "agent" ? cleanMarkdown(text) : text;
+  const escapedText = escapeHtml(cleanedText);
+  const formattedText = escapedText.replace(/\n/g, "<br>");
+  messageElement.innerHTML = formattedText;
+  messageElement.style.whiteSpace = "pre-wrap";
+  messageElement.style.wordWrap = "break-word";
+  chatHistory.appendChild(messageElement);
+  chatHistory.scrollTop = chatHistory.scrollHeight;
+}
+
+async function sendMessage() {
+  const message = userInput.value.trim();
+  if (message === "") return;
+
+  addMessage("user", message);
+  userInput.value = "";
+  sendBtn.disabled = true;
+
+  try {
+    const response = await fetch("/api/chat", {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ message: message }),
+    });
+
+    const data = await response.json();
+    if (data.response) {
+      addMessage("agent", data.response);
+    } else if (data.error) {
+      addMessage("agent", `Error: ${data.error}`);
+    } else {
+      addMessage("agent", "Unexpected response from server.");
+    }
+  } catch (error) {
+    console.error("Error:", error);
+    addMessage("agent", "Sorry, something went wrong. Please try again.");
+  } finally {
+    sendBtn.disabled = false;
+    userInput.focus();
+  }
+}
+
+sendBtn.addEventListener("click", sendMessage);
+userInput.addEventListener("keypress", (e) => {
+  if (e.key === "Enter" && !e.shiftKey) {
+    e.preventDefault();
+    sendMessage();
+  }
+});
+
+userInput.focus();
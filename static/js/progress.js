@@ -0,0 +1,277 @@
+// Load progress data when page loads
+document.addEventListener('DOMContentLoaded', loadProgress);
+
+// Handle form submission
+document.getElementById('progress-form').addEventListener('submit', async (e) => {
+  e.preventDefault();
+
+  const subject = document.getElementById('subject').value;
+  const hoursStudied = parseFloat(document.getElementById('hours-studied').value);
+
+  if (!subject) {
+    showMessage('Please create a timetable first to track progress.', 'error');
+    return;
+  }
+
+  if (hoursStudied <= 0) {
+    showMessage('Please enter a valid number of hours studied.', 'error');
+    return;
+  }
+
+  try {
+    const response = await fetch('/api/progress/update', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        subject: subject,
+        hours_studied: hoursStudied
+      })
+    });
+
+    const data = await response.json();
+
+    if (response.ok) {
+      showMessage(`Successfully logged ${hoursStudied} hours for ${subject}!`, 'success');
+      document.getElementById('hours-studied').value = '';
+      loadProgress(); // Reload progress data
+    } else {
+      showMessage(data.error || 'Failed to update progress.', 'error');
+    }
+  } catch (error) {
+    console.error('Error updating progress:', error);
+    showMessage('Failed to update progress. Please try again.', 'error');
+  }
+});
+
+async function loadProgress() {
+  try {
+    const response = await fetch('/api/progress');
+    const data = await response.json();
+
+    if (response.ok) {
+      // Update stats
+      document.getElementById('total-hours').textContent = data.total_hours.toFixed(1);
+      document.getElementById('topics-covered').textContent = data.topics_covered;
+      document.getElementById('day-streak').textContent = data.day_streak;
+      document.getElementById('average-focus').textContent = `${data.average_focus}%`;
+
+      // Update subject field
+      const subjectInput = document.getElementById('subject');
+      if (data.current_subject) {
+        subjectInput.value = data.current_subject;
+        subjectInput.placeholder = '';
+      } else {
+        subjectInput.value = '';
+        subjectInput.placeholder = 'No timetable created yet';
+      }
+
+      // Show subject progress
+      updateSubjectProgress(data.subjects);
+    }
+  } catch (error) {
+    console.error('Error loading progress:', error);
+  }
+}
+
+function updateSubjectProgress(subjects) {
+  const section = document.getElementById('subject-progress-section');
+  const content = document.getElementById('subject-progress-content');
+
+  if (Object.keys(subjects).length === 0) {
+    section.style.display = 'none';
+    return;
+  }
+
+  section.style.display = 'block';
+  content.innerHTML = '<h3>Subject Progress</h3>';
+
+  for (const [subject, progress] of Object.entries(subjects)) {
+    const percentage = progress.total_hours > 0 ? 
+      Math.min((progress.hours_studied / progress.total_hours) * 100, 100) : 0;
+
+    const progressHtml = `
+      <p style="margin-top: 1.5rem;"><strong>${subject}:</strong> ${progress.hours_studied.toFixed(1)}/${progress.total_hours} hours (${percentage.toFixed(1)}% Complete)</p>
+      <div class="progress-bar">
+        <div class="progress-fill" style="width: ${percentage}%; background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);"></div>
+      </div>
+    `;
+    content.innerHTML += progressHtml;
+  }
+}
+
+function showMessage(message, type) {
+  const messageDiv = document.getElementById('progress-message');
+  messageDiv.textContent = message;
+  messageDiv.className = `mt-4 p-3 rounded-md ${type === 'success' ? 'bg-green-100 text-green-800' : 'bg-red-100 text-red-800'}`;
+  messageDiv.classList.remove('hidden');
+
+  // Hide message after 5 seconds
+  setTimeout(() => {
+    messageDiv.classList.add('hidden');
+  }, 5000);
+}
+
+// Quiz functionality
+document.addEventListener('DOMContentLoaded', () => {
+  const genBtn = document.getElementById('generate-quiz-btn');
+  const submitBtn = document.getElementById('submit-quiz-btn');
+  const historyBtn = document.getElementById('view-history-btn');
+
+  if (genBtn) genBtn.addEventListener('click', generateQuiz);
+  if (submitBtn) submitBtn.addEventListener('click', submitQuiz);
+  if (historyBtn) historyBtn.addEventListener('click', viewHistory);
+});
+
+async function generateQuiz() {
+  // Hide previous results/history
+  document.getElementById('quiz-results').style.display = 'none';
+  document.getElementById('quiz-history').style.display = 'none';
+
+  try {
+    const res = await fetch('/api/quiz/generate', { method: 'POST' });
+    const data = await res.json();
+    if (!res.ok) {
+      showMessage(data.error || 'Failed to generate quiz.', 'error');
+      return;
+    }
+
+    renderQuestions(data.questions);
+  } catch (err) {
+    console.error('Error generating quiz:', err);
+    showMessage('Failed to generate quiz. Try again.', 'error');
+  }
+}
+
+function renderQuestions(questions) {
+  const container = document.getElementById('quiz-container');
+  const form = document.getElementById('quiz-form');
+  form.innerHTML = '';
+
+  questions.forEach((q, idx) => {
+    const qDiv = document.createElement('div');
+    qDiv.style.marginTop = '1rem';
+    qDiv.innerHTML = `
+      <p><strong>Q${idx+1}.</strong> ${q.question}</p>
+    `;
+
+    const opts = document.createElement('div');
+    q.options.forEach((opt, oi) => {
+      const label = document.createElement('label');
+      label.style.display = 'block';
+      label.style.marginTop = '0.25rem';
+      const val = String.fromCharCode(65 + oi);
+      label.innerHTML = `<input type="radio" name="q-${idx}" value="${val}"> ${val}. ${opt}`;
+      opts.appendChild(label);
+    });
+
+    form.appendChild(qDiv);
+    form.appendChild(opts);
+  });
+
+  container.style.display = 'block';
+  // Scroll to quiz
+  container.scrollIntoView({ behavior: 'smooth' });
+}
+
+async function submitQuiz(e) {
+  e && e.preventDefault();
+  const form = document.getElementById('quiz-form');
+  if (!form) return;
+
+  const answers = [];
+  const elems = form.querySelectorAll('[name^="q-"]');
+  // Determine number of questions
+  const qs = new Set();
+  elems.forEach(el => {
+    qs.add(el.name);
+  });
+  const qCount = qs.size;
+
+  for (let i = 0; i < qCount; i++) {
+    const name = `q-${i}`;
+    const selected = form.querySelector(`input[name='${name}']:checked`);
+    answers.push(selected ? selected.value : '');
+  }
+
+  try {
+    const res = await fetch('/api/quiz/submit', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ answers })
+    });
+
+    const data = await res.json();
+    if (!res.ok) {
+      showMessage(data.error || 'Failed to submit quiz.', 'error');
+      return;
+    }
+
+    displayQuizResults(data);
+  } catch (err) {
+    console.error('Error submitting quiz:', err);
+    showMessage('Failed to submit quiz. Try again.', 'error');
+  }
+}
+
+function displayQuizResults(results) {
+  const el = document.getElementById('quiz-results');
+  el.style.display = 'block';
+  el.innerHTML = '';
+
+  const scoreHtml = `<h3>Score: ${results.correct_answers}/${results.total_questions} (${results.score_percentage.toFixed(1)}%)</h3>`;
+  el.innerHTML += scoreHtml;
+
+  // Topic performance
+  el.innerHTML += '<h4 style="margin-top:0.75rem;">Topic Performance</h4>';
+  for (const [topic, perf] of Object.entries(results.topic_performance || {})) {
+    const pct = ((perf.correct / perf.total) * 100).toFixed(1);
+    el.innerHTML += `<p><strong>${topic}:</strong> ${perf.correct}/${perf.total} (${pct}%)</p>`;
+  }
+
+  // Weak/strong areas
+  if (results.weak_areas && results.weak_areas.length) {
+    el.innerHTML += `<p style="margin-top:0.75rem;"><strong>Weak areas:</strong> ${results.weak_areas.join(', ')}</p>`;
+  }
+  if (results.strong_areas && results.strong_areas.length) {
+    el.innerHTML += `<p><strong>Strong areas:</strong> ${results.strong_areas.join(', ')}</p>`;
+  }
+
+  // Recommendations
+  if (results.recommendations && results.recommendations.length) {
+    el.innerHTML += '<h4 style="margin-top:0.75rem;">Recommendations</h4>';
+    results.recommendations.forEach(r => {
+      el.innerHTML += `<p>- ${r}</p>`;
+    });
+  }
+
+  el.scrollIntoView({ behavior: 'smooth' });
+}
+
+async function viewHistory() {
+  try {
+    const res = await fetch('/api/quiz/history');
+    const data = await res.json();
+    if (!res.ok) {
+      showMessage(data.error || 'Failed to load history.', 'error');
+      return;
+    }
+
+    const el = document.getElementById('quiz-history');
+    el.style.display = 'block';
+    el.innerHTML = '<h3>Quiz History</h3>';
+    if (!data.history || data.history.length === 0) {
+      el.innerHTML += '<p>No quizzes taken yet.</p>';
+      return;
+    }
+
+    data.history.slice().reverse().forEach(item => {
+      el.innerHTML += `<p><strong>${item.subject}</strong> — ${new Date(item.date).toLocaleString()}: ${item.score.toFixed(1)}% — Weak: ${item.weak_areas.join(', ')}</p>`;
+    });
+    el.scrollIntoView({ behavior: 'smooth' });
+  } catch (err) {
+    console.error('Error loading history:', err);
+    showMessage('Failed to load quiz history.', 'error');
+  }
+}
@@ -0,0 +1,32 @@
+const getRecBtn = document.getElementById("get-rec-btn");
+const recommendationResult = document.getElementById("recommendation-result");
+const recTask = document.getElementById("rec-task");
+const recSubject = document.getElementById("rec-subject");
+const recReason = document.getElementById("rec-reason");
+const recDuration = document.getElementById("rec-duration");
+
+getRecBtn.addEventListener("click", async () => {
+  getRecBtn.disabled = true;
+  getRecBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Getting Recommendation...';
+
+  try {
+    const response = await fetch('/api/study-now/recommend');
+    const data = await response.json();
+
+    if (response.ok) {
+      recTask.textContent = data.task;
+      recSubject.textContent = `Subject: ${data.subject}`;
+      recReason.textContent = data.reason;
+      recDuration.textContent = data.duration;
+      recommendationResult.classList.add("show");
+    } else {
+      alert(data.error || 'Failed to get recommendation. Please create a timetable first.');
+    }
+  } catch (error) {
+    console.error("Error getting recommendation:", error);
+    alert("Failed to get recommendation. Please try again.");
+  } finally {
+    getRecBtn.disabled = false;
+    getRecBtn.innerHTML = '<i class="fas fa-sparkles"></i> Get Recommendation';
+  }
+});
@@ -0,0 +1,54 @@
+const form = document.getElementById("timetable-form");
+const resultsSection = document.getElementById("schedule-results");
+const scheduleContent = document.getElementById("schedule-content");
+const submitBtn = form.querySelector(".submit-btn");
+
+form.addEventListener("submit", async (e) => {
+  e.preventDefault();
+
+  const deadline = document.getElementById("deadline").value;
+  const subject = document.getElementById("subject").value;
+  const target = document.getElementById("target").value;
+  const description = document.getElementById("description").value;
+
+  // Show loading state
+  submitBtn.disabled = true;
+  submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Creating Schedule...';
+
+  scheduleContent.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Generating your personalized study schedule...</div>';
+  resultsSection.style.display = 'block';
+
+  try {
+    const response = await fetch('/api/timetable/create', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        deadline: deadline,
+        subject: subject,
+        target: parseFloat(target),
+        description: description
+      })
+    });
+
+    const data = await response.json();
+
+    if (response.ok) {
+      // Display the schedule
+      scheduleContent.innerHTML = data.schedule;
+      // Scroll to results
+      resultsSection.scrollIntoView({ behavior: 'smooth' });
+    } else {
+      scheduleContent.innerHTML = `<div class="error"><i class="fas fa-exclamation-triangle"></i> ${data.error || 'Failed to create timetable'}</div>`;
+    }
+
+  } catch (error) {
+    console.error("Error creating timetable:", error);
+    scheduleContent.innerHTML = '<div class="error"><i class="fas fa-exclamation-triangle"></i> Failed to create timetable. Please try again.</div>';
+  } finally {
+    // Reset button state
+    submitBtn.disabled = false;
+    submitBtn.innerHTML = '<i class="fas fa-check"></i> Create Timetable';
+  }
+});